@@ -4,52 +4,134 @@ CV Generator Script - JSONResume Compatible
 Reads JSONResume format data and generates LaTeX CV with configurable templates
 """
 
-import json
+import re
 import sys
-import os
 import shutil
+import subprocess
 import yaml
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
 from pathlib import Path
 from datetime import datetime
 
+# Prefer the libyaml-backed loader when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
 
+# Prefer orjson for parsing CV data when it is installed
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
+
+# Repository paths
+_BASE_DIR = Path(__file__).resolve().parent.parent
+_TEMPLATE_DIR = _BASE_DIR / 'template'
+_CONFIG_FILE = _BASE_DIR / 'config.yaml'
+
+# Use /output for Docker or ./output for local
+_OUTPUT_DIR = Path('/output') if Path('/output').is_dir() else _BASE_DIR / 'output'
+
+
+@lru_cache(maxsize=1)
 def load_config():
     """Load configuration from config.yaml"""
-    config_file = Path(__file__).parent.parent / 'config.yaml'
-    if config_file.exists():
-        with open(config_file, 'r') as f:
-            return yaml.safe_load(f)
+    if _CONFIG_FILE.exists():
+        with open(_CONFIG_FILE, 'r') as f:
+            return yaml.load(f, Loader=_YamlLoader)
     return {}
 
 
+@lru_cache(maxsize=8)
+def _read_text_cached(path_str, mtime_ns, size):
+    """Read a UTF-8 file; cache keyed on path, mtime and size"""
+    return Path(path_str).read_text(encoding='utf-8')
+
+
+def _read_text(path):
+    """Read a UTF-8 text file, reusing cached contents while it is unchanged"""
+    stat = Path(path).stat()
+    return _read_text_cached(str(path), stat.st_mtime_ns, stat.st_size)
+
+
+# Translation table for special LaTeX characters
+_LATEX_TRANSLATE = str.maketrans({
+    '&': r'\&',
+    '%': r'\%',
+    '$': r'\$',
+    '#': r'\#',
+    '_': r'\_',
+    '{': r'\{',
+    '}': r'\}',
+    '~': r'\textasciitilde{}',
+    '^': r'\^{}',
+})
+
+_PLACEHOLDER_RE = re.compile(r'\{\{(\w+)\}\}')
+
+# Section labels per language
+_LABELS = {
+    'en': {
+        'summary': 'Summary',
+        'experience': 'Experience',
+        'education': 'Education',
+        'skills': 'Skills',
+        'languages': 'Languages',
+        'additional': 'Additional Information'
+    },
+    'it': {
+        'summary': 'Profilo',
+        'experience': 'Esperienza',
+        'education': 'Istruzione',
+        'skills': 'Competenze',
+        'lingue': 'Lingue',
+        'additional': 'Informazioni Aggiuntive'
+    },
+}
+
+# Country code to full country name per language
+_COUNTRY_MAP = {
+    'en': {'IT': 'Italy'},
+    'it': {'IT': 'Italia'},
+}
+
+
+@lru_cache(maxsize=2048)
 def escape_latex(text):
-    """Escape special LaTeX characters"""
+    """Escape special LaTeX characters in a single pass"""
     if not text:
         return ""
 
-    replacements = {
-        '&': r'\&',
-        '%': r'\%',
-        '$': r'\$',
-        '#': r'\#',
-        '_': r'\_',
-        '{': r'\{',
-        '}': r'\}',
-        '~': r'\textasciitilde{}',
-        '^': r'\^{}',
-    }
+    return text.translate(_LATEX_TRANSLATE)
 
-    for old, new in replacements.items():
-        text = text.replace(old, new)
 
-    return text
+def _escape_tree(obj):
+    """Return a copy of parsed JSON data with every string LaTeX-escaped"""
+    if obj is None:
+        return ""
+    if isinstance(obj, str):
+        return escape_latex(obj)
+    if isinstance(obj, dict):
+        return {key: _escape_tree(value) for key, value in obj.items()}
+    if isinstance(obj, list):
+        return [_escape_tree(item) for item in obj]
+    return obj
 
 
+@lru_cache(maxsize=256)
 def format_date(date_str, lang='en'):
     """Format date from YYYY-MM-DD to MM/YYYY or localized format"""
     if not date_str:
         return ""
 
+    # Fast path for well-formed ISO 8601 dates, avoiding strptime
+    if (len(date_str) == 10 and date_str[4] == '-' and date_str[7] == '-'
+            and date_str[:4].isdigit() and date_str[5:7].isdigit()
+            and date_str[8:].isdigit()):
+        return date_str[5:7] + '/' + date_str[:4]
+
     try:
         date_obj = datetime.strptime(date_str, '%Y-%m-%d')
         return date_obj.strftime('%m/%Y')
@@ -70,16 +152,15 @@ def format_date_range(start_date, end_date, lang='en'):
 
 
 def generate_experience_section(work, config, lang='en'):
-    """Generate LaTeX for work experience section"""
-    latex = ""
+    """Yield LaTeX chunks for work experience section from escaped data"""
     show_tech = config.get('show_technologies', True)
     max_highlights = config.get('max_highlights_per_job', 0)
 
     for job in work:
-        latex += "\\cventrylong\n"
-        latex += f"  {{{escape_latex(job.get('position', ''))}}}\n"
-        latex += f"  {{{escape_latex(job.get('name', ''))}}}\n"
-        latex += f"  {{{escape_latex(job.get('location', ''))}}}\n"
+        yield "\\cventrylong\n"
+        yield f"  {{{job.get('position', '')}}}\n"
+        yield f"  {{{job.get('name', '')}}}\n"
+        yield f"  {{{job.get('location', '')}}}\n"
 
         # Format date range
         date_range = format_date_range(
@@ -87,45 +168,41 @@ def generate_experience_section(work, config, lang='en'):
             job.get('endDate', ''),
             lang
         )
-        latex += f"  {{{escape_latex(date_range)}}}\n"
-        latex += "  {\n"
+        yield f"  {{{date_range}}}\n"
+        yield "  {\n"
 
         if job.get('summary'):
-            latex += f"    {escape_latex(job['summary'])}\n"
+            yield f"    {job['summary']}\n"
 
         if job.get('highlights'):
             highlights = job['highlights']
             if max_highlights > 0:
                 highlights = highlights[:max_highlights]
 
-            latex += "    \\begin{cvitems}\n"
+            yield "    \\begin{cvitems}\n"
             for highlight in highlights:
-                latex += f"      \\item {{{escape_latex(highlight)}}}\n"
-            latex += "    \\end{cvitems}\n"
+                yield f"      \\item {{{highlight}}}\n"
+            yield "    \\end{cvitems}\n"
 
-        latex += "  }\n"
+        yield "  }\n"
 
         # Add technologies/keywords line
         if show_tech and job.get('keywords'):
             tech = ', '.join(job['keywords'])
-            latex += f"  {{{escape_latex(tech)}}}\n"
+            yield f"  {{{tech}}}\n"
         else:
-            latex += "  {}\n"
+            yield "  {}\n"
 
-        latex += "\n"
-
-    return latex
+        yield "\n"
 
 
 def generate_education_section(education, lang='en'):
-    """Generate LaTeX for education section"""
-    latex = ""
-
+    """Yield LaTeX chunks for education section from escaped data"""
     for edu in education:
-        latex += "\\cventry\n"
-        latex += f"  {{{escape_latex(edu.get('studyType', ''))}}}\n"
-        latex += f"  {{{escape_latex(edu.get('institution', ''))}}}\n"
-        latex += f"  {{{escape_latex(edu.get('location', ''))}}}\n"
+        yield "\\cventry\n"
+        yield f"  {{{edu.get('studyType', '')}}}\n"
+        yield f"  {{{edu.get('institution', '')}}}\n"
+        yield f"  {{{edu.get('location', '')}}}\n"
 
         # Format date range
         date_range = format_date_range(
@@ -133,28 +210,37 @@ def generate_education_section(education, lang='en'):
             edu.get('endDate', ''),
             lang
         )
-        latex += f"  {{{escape_latex(date_range)}}}\n"
-        latex += "  {}\n\n"
-
-    return latex
+        yield f"  {{{date_range}}}\n"
+        yield "  {}\n\n"
 
 
 def generate_skills_section(skills, lang='en'):
-    """Generate LaTeX for skills section from JSONResume format"""
-    latex = ""
-
+    """Yield LaTeX chunks for skills section from escaped JSONResume data"""
     for skill in skills:
         skill_name = skill.get('name', '')
         keywords = skill.get('keywords', [])
 
         if keywords:
-            latex += "\\cvskills\n"
-            latex += f"  {{{escape_latex(skill_name)}}}\n"
-            latex += "  {\n"
-            latex += "    " + " \\textbar\\ ".join(escape_latex(kw) for kw in keywords)
-            latex += "\n  }\n\n"
-
-    return latex
+            yield "\\cvskills\n"
+            yield f"  {{{skill_name}}}\n"
+            yield "  {\n"
+            yield "    " + " \\textbar\\ ".join(keywords)
+            yield "\n  }\n\n"
+
+
+def render_template(template, subs):
+    """Yield template chunks with {{KEY}} placeholders replaced from subs"""
+    pos = 0
+    for m in _PLACEHOLDER_RE.finditer(template):
+        yield template[pos:m.start()]
+        # Unknown placeholders are left intact; callables stream their chunks
+        value = subs.get(m.group(1), m.group(0))
+        if callable(value):
+            yield from value()
+        else:
+            yield value
+        pos = m.end()
+    yield template[pos:]
 
 
 def generate_cv(json_file, output_dir, lang='en'):
@@ -164,41 +250,26 @@ def generate_cv(json_file, output_dir, lang='en'):
     config = load_config()
 
     # Read JSON data
-    with open(json_file, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    with open(json_file, 'rb') as f:
+        data = _json_loads(f.read())
+
+    # Escape every string once up front; profile links are used verbatim
+    escaped = _escape_tree(data)
 
     # Read template
     template_name = config.get('template', 'awesome-cv')
-    template_file = Path(__file__).parent.parent / 'template' / f'{template_name}.tex'
+    template_file = _TEMPLATE_DIR / f'{template_name}.tex'
 
     if not template_file.exists():
-        template_file = Path(__file__).parent.parent / 'template' / 'cv.tex'
+        template_file = _TEMPLATE_DIR / 'cv.tex'
 
-    with open(template_file, 'r', encoding='utf-8') as f:
-        template = f.read()
+    template = _read_text(template_file)
 
     # Section labels
-    if lang == 'en':
-        labels = {
-            'summary': 'Summary',
-            'experience': 'Experience',
-            'education': 'Education',
-            'skills': 'Skills',
-            'languages': 'Languages',
-            'additional': 'Additional Information'
-        }
-    else:
-        labels = {
-            'summary': 'Profilo',
-            'experience': 'Esperienza',
-            'education': 'Istruzione',
-            'skills': 'Competenze',
-            'lingue': 'Lingue',
-            'additional': 'Informazioni Aggiuntive'
-        }
+    labels = _LABELS[lang]
 
     # Extract basics (personal information)
-    basics = data.get('basics', {})
+    basics = escaped.get('basics', {})
 
     # Build full address from location object
     location = basics.get('location', {})
@@ -211,7 +282,7 @@ def generate_cv(json_file, output_dir, lang='en'):
         address_parts.append(location['city'])
     if location.get('countryCode'):
         # Map country code to full name if needed
-        country_map = {'IT': 'Italy' if lang == 'en' else 'Italia'}
+        country_map = _COUNTRY_MAP[lang]
         country = country_map.get(location['countryCode'], location['countryCode'])
         address_parts.append(country)
 
@@ -221,64 +292,125 @@ def generate_cv(json_file, output_dir, lang='en'):
     linkedin_username = ''
     github_username = ''
 
-    for profile in basics.get('profiles', []):
+    for profile in data.get('basics', {}).get('profiles', []):
         network = profile.get('network', '').lower()
         if network == 'linkedin':
             linkedin_username = profile.get('username', '')
         elif network == 'github':
             github_username = profile.get('username', '')
 
-    # Replace placeholders in template
-    cv_content = template
-    cv_content = cv_content.replace('{{NAME}}', escape_latex(basics.get('name', '')))
-    cv_content = cv_content.replace('{{TITLE}}', escape_latex(basics.get('label', '')))
-    cv_content = cv_content.replace('{{ADDRESS}}', escape_latex(full_address))
-    cv_content = cv_content.replace('{{PHONE}}', escape_latex(basics.get('phone', '')))
-    cv_content = cv_content.replace('{{EMAIL}}', escape_latex(basics.get('email', '')))
-    cv_content = cv_content.replace('{{LINKEDIN}}', linkedin_username)
-    cv_content = cv_content.replace('{{GITHUB}}', github_username)
-    cv_content = cv_content.replace('{{HOMEPAGE}}', basics.get('url', ''))
+    # Placeholder values, keyed by the name inside {{...}}; sections are
+    # passed as callables so they are generated while the file is written
+    subs = {
+        'NAME': basics.get('name', ''),
+        'TITLE': basics.get('label', ''),
+        'ADDRESS': full_address,
+        'PHONE': basics.get('phone', ''),
+        'EMAIL': basics.get('email', ''),
+        'LINKEDIN': linkedin_username,
+        'GITHUB': github_username,
+        'HOMEPAGE': data.get('basics', {}).get('url', ''),
+        'LABEL_SUMMARY': labels['summary'],
+        'SUMMARY': basics.get('summary', ''),
+        'LABEL_EXPERIENCE': labels['experience'],
+        'EXPERIENCE': partial(generate_experience_section, escaped.get('work', []), config, lang),
+        'LABEL_EDUCATION': labels['education'],
+        'EDUCATION': partial(generate_education_section, escaped.get('education', []), lang),
+        'LABEL_SKILLS': labels['skills'],
+        'SKILLS': partial(generate_skills_section, escaped.get('skills', []), lang),
+    }
 
     # Apply color scheme if specified
     color = config.get('color', 'skyblue')
-    cv_content = cv_content.replace('\\colorlet{awesome}{awesome-skyblue}',
-                                    f'\\colorlet{{awesome}}{{awesome-{color}}}')
+    template = template.replace('\\colorlet{awesome}{awesome-skyblue}',
+                                f'\\colorlet{{awesome}}{{awesome-{color}}}')
 
-    # Replace section labels
-    cv_content = cv_content.replace('{{LABEL_SUMMARY}}', labels['summary'])
-    cv_content = cv_content.replace('{{SUMMARY}}', escape_latex(basics.get('summary', '')))
+    # Stream the rendered template straight into the output LaTeX file
+    output_tex = Path(output_dir) / f'cv-{lang}.tex'
+    with open(output_tex, 'wb', buffering=1 << 16) as f:
+        f.writelines(chunk.encode('utf-8') for chunk in render_template(template, subs))
 
-    cv_content = cv_content.replace('{{LABEL_EXPERIENCE}}', labels['experience'])
-    cv_content = cv_content.replace('{{EXPERIENCE}}',
-                                    generate_experience_section(data.get('work', []), config, lang))
+    print(f"Generated LaTeX file: {output_tex}")
+    return output_tex
 
-    cv_content = cv_content.replace('{{LABEL_EDUCATION}}', labels['education'])
-    cv_content = cv_content.replace('{{EDUCATION}}',
-                                    generate_education_section(data.get('education', []), lang))
 
-    cv_content = cv_content.replace('{{LABEL_SKILLS}}', labels['skills'])
-    cv_content = cv_content.replace('{{SKILLS}}',
-                                    generate_skills_section(data.get('skills', []), lang))
+def run_latex(args, output_dir):
+    """Run a LaTeX command in output_dir and return its exit code"""
+    try:
+        return subprocess.run(args, cwd=output_dir).returncode
+    except FileNotFoundError:
+        # Report a missing binary like a shell would, as a failed command
+        return 127
 
-    # Write output LaTeX file
-    output_tex = Path(output_dir) / f'cv-{lang}.tex'
-    with open(output_tex, 'w', encoding='utf-8') as f:
-        f.write(cv_content)
 
-    print(f"Generated LaTeX file: {output_tex}")
-    return output_tex
+def report_latex_failure(tool, ret, output_dir, lang):
+    """Print the tail of the LaTeX log and exit after a failed compile"""
+    print(f"\n✗ {tool} failed with code {ret}")
+    print(f"Check the log file: {output_dir}/cv-{lang}.log")
+    # Print last 50 lines of log for debugging
+    log_file = output_dir / f'cv-{lang}.log'
+    if log_file.exists():
+        print("\n=== Last 50 lines of LaTeX log ===")
+        with open(log_file, 'r', encoding='utf-8', errors='ignore') as f:
+            lines = f.readlines()
+            for line in lines[-50:]:
+                print(line.rstrip())
+    sys.exit(1)
+
+
+def build_cv(lang, output_dir):
+    """Generate the LaTeX CV for a language and compile it to PDF
+
+    Expects awesome-cv.cls to already be in output_dir.
+    """
+
+    json_file = _BASE_DIR / 'data' / f'cv-{lang}.json'
+
+    # Generate CV
+    output_tex = generate_cv(json_file, output_dir, lang)
+
+    # Compile LaTeX to PDF
+    print(f"Compiling PDF for {lang}...")
+
+    if shutil.which('latexmk'):
+        # latexmk reruns xelatex only as many times as the document needs
+        ret = run_latex(['latexmk', '-xelatex', '-interaction=nonstopmode', f'cv-{lang}.tex'],
+                        output_dir)
+        if ret != 0:
+            report_latex_failure('latexmk', ret, output_dir, lang)
+    else:
+        # Run xelatex twice for proper references and bookmarks
+        for i in range(2):
+            ret = run_latex(['xelatex', '-interaction=nonstopmode', f'cv-{lang}.tex'],
+                            output_dir)
+            if ret != 0:
+                report_latex_failure('xelatex', ret, output_dir, lang)
+
+    # Clean up all auxiliary files, keeping only the PDF
+    # Remove LaTeX auxiliary files
+    for ext in ('.aux', '.out', '.tex', '.log', '.fls', '.fdb_latexmk', '.xdv'):
+        (output_dir / f'cv-{lang}{ext}').unlink(missing_ok=True)
+
+    pdf_file = output_dir / f'cv-{lang}.pdf'
+    if pdf_file.exists():
+        print(f"\n✓ Successfully generated: {pdf_file}")
+    else:
+        print(f"\n✗ Failed to generate PDF")
+        sys.exit(1)
+
+    return pdf_file
 
 
 if __name__ == '__main__':
     if len(sys.argv) < 2:
-        print("Usage: generate-cv.py <language>")
+        print("Usage: generate-cv.py <language|all>")
         print("Example: generate-cv.py en")
         sys.exit(1)
 
     lang = sys.argv[1]
 
-    if lang not in ['en', 'it']:
-        print("Supported languages: en, it")
+    if lang not in ['en', 'it', 'all']:
+        print("Supported languages: en, it (or all)")
         sys.exit(1)
 
     # Check if PyYAML is available
@@ -288,61 +420,24 @@ if __name__ == '__main__':
         print("Warning: PyYAML not found, using default configuration")
         yaml = None
 
-    # Paths
-    base_dir = Path(__file__).parent.parent
-    json_file = base_dir / 'data' / f'cv-{lang}.json'
+    langs = ['en', 'it'] if lang == 'all' else [lang]
 
-    # Use /output for Docker or ./output for local
-    if os.path.exists('/output'):
-        output_dir = Path('/output')
-    else:
-        output_dir = base_dir / 'output'
+    output_dir = _OUTPUT_DIR
 
     # Create output directory if it doesn't exist
     output_dir.mkdir(exist_ok=True)
 
-    # Copy template files to output directory
-    template_dir = base_dir / 'template'
-    shutil.copy(template_dir / 'awesome-cv.cls', output_dir / 'awesome-cv.cls')
+    # Copy template files to output directory, shared by every language
+    shutil.copyfile(_TEMPLATE_DIR / 'awesome-cv.cls', output_dir / 'awesome-cv.cls')
 
-    # Generate CV
-    output_tex = generate_cv(json_file, output_dir, lang)
-
-    # Compile LaTeX to PDF
-    print(f"Compiling PDF for {lang}...")
-    os.chdir(output_dir)
-
-    # Run xelatex twice for proper references
-    for i in range(2):
-        ret = os.system(f'xelatex -interaction=nonstopmode cv-{lang}.tex')
-        if ret != 0:
-            print(f"\n✗ xelatex failed with code {ret}")
-            print(f"Check the log file: {output_dir}/cv-{lang}.log")
-            # Print last 50 lines of log for debugging
-            log_file = output_dir / f'cv-{lang}.log'
-            if log_file.exists():
-                print("\n=== Last 50 lines of LaTeX log ===")
-                with open(log_file, 'r', encoding='utf-8', errors='ignore') as f:
-                    lines = f.readlines()
-                    for line in lines[-50:]:
-                        print(line.rstrip())
-            sys.exit(1)
-
-    # Clean up all auxiliary files, keeping only the PDF
-    # Remove LaTeX auxiliary files
-    for ext in ['.aux', '.out', '.tex', '.log']:
-        aux_file = output_dir / f'cv-{lang}{ext}'
-        if aux_file.exists():
-            aux_file.unlink()
+    if len(langs) == 1:
+        build_cv(langs[0], output_dir)
+    else:
+        # Languages use distinct file names, so they can compile side by side
+        with ProcessPoolExecutor(max_workers=len(langs)) as executor:
+            futures = [executor.submit(build_cv, code, output_dir) for code in langs]
+            for future in futures:
+                future.result()
 
     # Remove template files copied to output directory
-    cls_file = output_dir / 'awesome-cv.cls'
-    if cls_file.exists():
-        cls_file.unlink()
-
-    pdf_file = output_dir / f'cv-{lang}.pdf'
-    if pdf_file.exists():
-        print(f"\n✓ Successfully generated: {pdf_file}")
-    else:
-        print(f"\n✗ Failed to generate PDF")
-        sys.exit(1)
+    (output_dir / 'awesome-cv.cls').unlink(missing_ok=True)